@@ -4,20 +4,39 @@ Script to process all news categories and generate Inshorts-style summaries.
 This script uses the Selenium-based approach to extract images and content from all news categories.
 
 PERFORMANCE OPTIMIZATION:
-- Uses a single shared browser instance across ALL categories and articles
-- Browser is created once at startup and reused for maximum efficiency
+- Uses a small pool of shared browser instances across ALL categories and articles
+- Browsers are created once at startup and reused for maximum efficiency
+- Categories are processed in parallel, one browser per worker process
 - Avoids the overhead of creating/destroying browser instances per category/article
 """
 
 import os
-import glob
 import argparse
 import logging
 import sys
-import subprocess
 import time
+import functools
+import shutil
+import tempfile
+import itertools
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, InitVar
 from pathlib import Path
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Make sibling scripts importable once, instead of on every category
+SCRIPTS_DIR = str(Path(__file__).parent)
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from generate_inshorts_selenium import load_news_data, process_news_data, save_to_json, create_http_session, ArticleCache
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +44,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Silence verbose WebDriver/HTTP debug output so those records are never formatted
+logging.getLogger("selenium").setLevel(logging.WARNING)
+logging.getLogger("urllib3").setLevel(logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("httpcore").setLevel(logging.WARNING)
+
+# Resource downloads blocked via CDP - the DOM (and <meta>/<img> attributes) still parse normally
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp",
+    "*.woff*", "*.css", "*.mp4",
+    "*googletagmanager*", "*doubleclick*", "*google-analytics*",
+]
+
+# Chrome command-line arguments shared by every browser instance
+_CHROME_ARGS = (
+    # Basic stability options
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-popup-blocking",
+    "--disable-notifications",
+    "--disable-infobars",
+    "--mute-audio",
+    
+    # PERFORMANCE OPTIMIZATIONS - CAREFUL NOT TO BREAK IMAGE EXTRACTION
+    # "--disable-images",  # REMOVED - This breaks image URL extraction! (downloads are blocked via CDP instead)
+    # "--disable-javascript",  # REMOVED - May break meta tag reading
+    "--disable-plugins",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-features=TranslateUI",
+    "--disable-ipc-flooding-protection",
+    
+    # MEMORY OPTIMIZATIONS - keep each pooled browser's working set small
+    "--no-zygote",
+    "--disable-software-rasterizer",
+    "--js-flags=--max-old-space-size=256",
+    
+    "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+)
+
+# Recycle each browser after this many articles to shed accumulated renderer memory
+RECYCLE_AFTER = 100
+
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="Generate Inshorts-style summaries for all news categories")
@@ -75,51 +139,94 @@ def parse_args():
         help="Specific categories to process (default: all available)"
     )
     
-    # Removed legacy options - always use shared browser for optimal performance
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=None,
+        help="Number of browser instances to process categories in parallel (default: min(4, number of categories))"
+    )
+    
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=RECYCLE_AFTER,
+        help="Restart each browser after loading this many articles in it"
+    )
+    
+    parser.add_argument(
+        "--cdp-navigate",
+        action="store_true",
+        help="Navigate to articles with direct CDP commands instead of WebDriver get()"
+    )
+    
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reprocess categories even if their output is newer than the input"
+    )
     
     return parser.parse_args()
 
 def get_available_categories(input_dir):
     """Get available news categories from input directory"""
-    categories = []
-    for file_path in glob.glob(os.path.join(input_dir, 'news_*.json')):
-        # Extract category from filename (news_category.json)
-        category = os.path.basename(file_path).replace('news_', '').replace('.json', '')
-        categories.append(category)
-    return categories
-
-def setup_shared_browser(headless=True):
+    # Extract category from filename (news_category.json) in a single directory scan
+    with os.scandir(input_dir) as entries:
+        return [
+            entry.name[5:-5] for entry in entries
+            if entry.is_file() and entry.name.startswith('news_') and entry.name.endswith('.json')
+        ]
+
+def stream_articles(path, n):
+    """Return at most n articles from a news JSON file without loading the whole file when ijson is available"""
+    if not IJSON_AVAILABLE:
+        return load_news_data(path).get('articles', [])[:n]
+    
+    # Materialize inside the with-block so the file is closed as soon as n articles are read
+    with open(path, 'rb') as f:
+        return list(itertools.islice(ijson.items(f, 'articles.item', use_float=True), n))
+
+def is_up_to_date(input_file, output_file):
+    """Check if a category's output is at least as new as its input"""
+    return (os.path.exists(input_file) and os.path.exists(output_file)
+            and os.stat(output_file).st_mtime >= os.stat(input_file).st_mtime)
+
+def filter_pending_jobs(jobs, force=False):
+    """Drop (category, input_file, output_file) jobs whose output is already up to date, unless forced"""
+    if force:
+        return list(jobs)
+    
+    pending_jobs = []
+    for job in jobs:
+        if is_up_to_date(job[1], job[2]):
+            logger.info("Skipping up-to-date category: %s", job[0])
+        else:
+            pending_jobs.append(job)
+    return pending_jobs
+
+@functools.lru_cache(maxsize=1)
+def _get_chromedriver_path():
+    """Resolve the ChromeDriver binary once per process and reuse it for every browser"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    
+    os.environ.setdefault("WDM_LOG_LEVEL", "0")
+    return ChromeDriverManager().install()
+
+def setup_shared_browser(headless=True, user_data_dir=None):
     """Set up a shared Selenium WebDriver for reuse across categories with performance optimizations"""
     try:
-        # Add the parent directory to sys.path to import selenium setup
-        sys.path.append(str(Path(__file__).parent))
-        
         from selenium import webdriver
         from selenium.webdriver.chrome.options import Options
         from selenium.webdriver.chrome.service import Service
-        from webdriver_manager.chrome import ChromeDriverManager
         
         options = Options()
-        # Basic stability options
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-popup-blocking")
-        options.add_argument("--disable-notifications")
-        options.add_argument("--disable-infobars")
-        options.add_argument("--mute-audio")
-        
-        # PERFORMANCE OPTIMIZATIONS - CAREFUL NOT TO BREAK IMAGE EXTRACTION
-        # options.add_argument("--disable-images")  # REMOVED - This breaks image URL extraction!
-        # options.add_argument("--disable-javascript")  # REMOVED - May break meta tag reading
-        options.add_argument("--disable-plugins")
-        options.add_argument("--disable-background-timer-throttling")
-        options.add_argument("--disable-backgrounding-occluded-windows")
-        options.add_argument("--disable-renderer-backgrounding")
-        options.add_argument("--disable-features=TranslateUI")
-        options.add_argument("--disable-ipc-flooding-protection")
-        
-        options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        # Return from driver.get() on DOMContentLoaded - meta tags are parsed by then
+        options.page_load_strategy = 'eager'
+        
+        # Static arguments are built once at module level
+        for arg in _CHROME_ARGS:
+            options.add_argument(arg)
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
         
         # Add headless mode if requested
         if headless:
@@ -128,47 +235,166 @@ def setup_shared_browser(headless=True):
             logger.info("Setting up OPTIMIZED shared browser in headless mode")
         
         # Initialize Chrome WebDriver with performance settings
-        service = Service(ChromeDriverManager().install())
+        service = Service(_get_chromedriver_path())
         driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(20)  # Reduced timeout for better performance
+        driver.implicitly_wait(0)  # Only explicit waits (see wait_for_og_tags)
+        driver.set_page_load_timeout(10)  # Eager loading returns sooner, so a shorter timeout suffices
+        
+        # Block image/font/stylesheet/tracker downloads instead of using --disable-images,
+        # so OG image URLs can still be read from the DOM
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
         
         logger.info("🚀 OPTIMIZED shared browser instance created successfully")
         return driver
     except Exception as e:
-        logger.error(f"Error setting up shared browser: {e}")
+        logger.error("Error setting up shared browser: %s", e)
         raise
 
-def process_category_with_shared_browser(category, input_dir, output_dir, max_articles, timeout, summary_length, driver):
-    """Process a single news category using a shared browser instance"""
-    input_file = os.path.join(input_dir, f'news_{category}.json')
-    output_file = os.path.join(output_dir, f'inshorts_{category}.json')
+# Marker set on the outgoing document; the new document won't have it
+_CDP_STALE_MARKER = "__inshortsNavigationPending"
+
+def cdp_navigate(driver, url, timeout=8):
+    """
+    Navigate with a direct CDP Page.navigate command instead of WebDriver's get().
+    Returns once the new document is interactive (matching the eager load strategy);
+    raises TimeoutException like driver.get() if that takes longer than the timeout.
+    """
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    
+    # Tag the current document so the poll can tell it apart from the new one
+    # (browser-side identity, no dependence on Python and Chrome clocks agreeing)
+    try:
+        driver.execute_cdp_cmd("Runtime.evaluate", {"expression": f"window.{_CDP_STALE_MARKER} = true"})
+    except WebDriverException:
+        pass  # No usable document yet (e.g. a crashed tab) - nothing stale to confuse the poll
+    
+    result = driver.execute_cdp_cmd("Page.navigate", {"url": url})
+    if result.get("errorText"):
+        raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+    
+    expression = f"window.{_CDP_STALE_MARKER} ? 'stale' : document.readyState"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            state = driver.execute_cdp_cmd(
+                "Runtime.evaluate", {"expression": expression, "returnByValue": True}
+            )["result"].get("value")
+        except WebDriverException:
+            # "Execution context was destroyed" etc. while the documents swap - keep polling
+            state = None
+        if state in ("interactive", "complete"):
+            return
+        time.sleep(0.1)
+    
+    raise TimeoutException(f"CDP navigation timed out after {timeout}s: {url}")
+
+@dataclass
+class ManagedDriver:
+    """Shared browser that is restarted after a number of articles or when its session is lost"""
+    headless: bool = True
+    recycle_after: int = RECYCLE_AFTER
+    driver: object = field(default=None, repr=False)
+    user_data_dir: str = field(default=None, repr=False)
+    articles_processed: int = 0
+    start: InitVar[bool] = True
+    
+    def __post_init__(self, start):
+        # With start=False the browser is started lazily by the first ensure_alive()
+        if start and self.driver is None:
+            self._start()
+    
+    def _start(self):
+        """Start a browser with its own throwaway profile directory"""
+        self.user_data_dir = tempfile.mkdtemp(prefix=f"chrome-{os.getpid()}-")
+        try:
+            self.driver = setup_shared_browser(headless=self.headless, user_data_dir=self.user_data_dir)
+        except Exception:
+            # Don't leave the profile directory behind when the browser fails to start
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
+            raise
+    
+    def record(self, count):
+        """Count browser page loads and recycle the browser once the limit is reached"""
+        self.articles_processed += count
+        if self.articles_processed >= self.recycle_after:
+            logger.info("♻️ Browser processed %d articles, recycling", self.articles_processed)
+            self.respawn()
+    
+    def ensure_alive(self):
+        """Respawn the browser if its session has been lost"""
+        if self.driver is None:
+            self.respawn()
+            return
+        
+        try:
+            self.driver.current_url
+        except Exception as e:
+            # WebDriverException for a lost session, connection errors if chromedriver itself died
+            logger.warning("🔄 Browser session lost, creating new one: %s", e)
+            self.respawn()
+    
+    def respawn(self):
+        """Replace the current browser with a fresh instance"""
+        self.quit()
+        self._start()
+        self.articles_processed = 0
+    
+    def quit(self):
+        """Safely quit the current browser and remove its profile directory"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning("Error closing browser: %s", e)
+            finally:
+                self.driver = None
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
+
+def process_category_with_shared_browser(job, max_articles, timeout, summary_length, managed_driver, session=None, cache=None, navigate=None):
+    """Process a single (category, input_file, output_file) job using a shared (managed) browser instance"""
+    category, input_file, output_file = job
     
     # Skip if input file doesn't exist
     if not os.path.exists(input_file):
-        logger.warning(f"Input file not found: {input_file}")
+        logger.warning("Input file not found: %s", input_file)
         return False
     
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-    
-    logger.info(f"Processing category: {category}")
+    logger.info("Processing category: %s", category)
     
     try:
-        # Import the processing functions directly
-        sys.path.append(str(Path(__file__).parent))
-        from generate_inshorts_selenium import load_news_data, process_news_data, save_to_json
-        import time
+        # Make sure the browser survived the previous category
+        managed_driver.ensure_alive()
         
-        # Load news data
-        news_data = load_news_data(input_file)
+        # Count only real browser page loads (cache and fast-path hits never touch the browser)
+        page_loads = 0
+        
+        def counting_navigate(driver, url, nav_timeout):
+            nonlocal page_loads
+            page_loads += 1
+            if navigate:
+                navigate(driver, url, nav_timeout)
+            else:
+                driver.get(url)
+        
+        # Stream only the articles we need instead of loading the whole file
+        news_data = {'articles': stream_articles(input_file, max_articles)}
         
         # Process news data to generate summaries using shared browser
         processed_articles = process_news_data(
             news_data, 
             max_articles, 
-            driver,
+            managed_driver.driver,
             timeout,
-            summary_length
+            summary_length,
+            max_workers=1,  # One managed browser per pool slot - --parallel bounds the browser count
+            session=session,
+            cache=cache,
+            navigate=counting_navigate
         )
         
         # Prepare output data
@@ -182,17 +408,68 @@ def process_category_with_shared_browser(category, input_dir, output_dir, max_ar
         }
         
         # Save to JSON file
-        save_to_json(output_data, output_file)
+        save_to_json(output_data, output_file, make_dirs=False)  # main() created the output directory
         
-        logger.info(f"Successfully processed category: {category}")
+        # Recycle only after the results are safely written; a failed restart leaves
+        # driver=None for the next category's ensure_alive() to retry
+        try:
+            managed_driver.record(page_loads)
+        except Exception as e:
+            logger.error("Error recycling browser: %s", e)
+        
+        logger.info("Successfully processed category: %s", category)
         return True
     except Exception as e:
-        logger.error(f"Error processing category {category}: {e}")
+        logger.error("Error processing category %s: %s", category, e)
         import traceback
         logger.error(traceback.format_exc())
+        try:
+            managed_driver.ensure_alive()
+        except Exception as respawn_error:
+            logger.error("Error respawning browser: %s", respawn_error)
         return False
 
-# Legacy process_category function removed - now always use shared browser for optimal performance
+# Per-process state for ProcessPoolExecutor workers (see worker_init)
+_worker_driver = None
+_worker_session = None
+_worker_cache = None
+
+def worker_init(headless, recycle_after, cache_path):
+    """Create this worker process's own (lazily started) browser, HTTP session and article cache connection"""
+    global _worker_driver, _worker_session, _worker_cache
+    # Never raise from here - a failing initializer breaks the whole pool. The browser is
+    # started by the first category's ensure_alive(), so a startup failure only fails that category
+    _worker_driver = ManagedDriver(headless=headless, recycle_after=recycle_after, start=False)
+    _worker_session = create_http_session()
+    try:
+        _worker_cache = ArticleCache(cache_path)
+    except Exception as e:
+        logger.warning("Article cache unavailable in worker %d, continuing without it: %s", os.getpid(), e)
+        _worker_cache = None
+    # Pool workers exit via os._exit(), which skips atexit handlers - use a multiprocessing finalizer
+    multiprocessing.util.Finalize(None, _worker_shutdown, exitpriority=10)
+
+def _worker_shutdown():
+    """Release the worker process's browser, session and cache"""
+    if _worker_driver:
+        _worker_driver.quit()
+    if _worker_session:
+        _worker_session.close()
+    if _worker_cache:
+        _worker_cache.close()
+
+def worker_process_category(job, max_articles, timeout, summary_length, use_cdp_navigate=False):
+    """Process a category job with the worker process's own browser"""
+    return process_category_with_shared_browser(
+        job,
+        max_articles,
+        timeout,
+        summary_length,
+        _worker_driver,
+        _worker_session,
+        _worker_cache,
+        cdp_navigate if use_cdp_navigate else None
+    )
 
 def main():
     """Main function"""
@@ -206,37 +483,65 @@ def main():
             categories = get_available_categories(args.input_dir)
         
         if not categories:
-            logger.error(f"No news categories found in {args.input_dir}")
+            logger.error("No news categories found in %s", args.input_dir)
             return 1
         
-        logger.info(f"Found {len(categories)} news categories: {', '.join(categories)}")
+        logger.info("Found %d news categories: %s", len(categories), ', '.join(categories))
+        
+        # Create output directory once and precompute per-category paths
+        os.makedirs(args.output_dir, exist_ok=True)
+        jobs = [
+            (category,
+             os.path.join(args.input_dir, f'news_{category}.json'),
+             os.path.join(args.output_dir, f'inshorts_{category}.json'))
+            for category in categories
+        ]
+        
+        # Skip up-to-date categories before starting any browsers
+        jobs = filter_pending_jobs(jobs, force=args.force)
+        success_count = len(categories) - len(jobs)
+        
+        if not jobs:
+            logger.info("All %d categories are up to date, nothing to process", len(categories))
+            return 0
         
         # Always use shared browser mode for optimal performance
-        logger.info("Using shared browser mode for better performance")
-        # Set up shared browser instance
-        logger.info("Setting up shared browser instance for all categories...")
-        driver = setup_shared_browser(headless=args.headless)
+        pool_size = args.parallel or min(4, len(jobs))
+        pool_size = max(1, min(pool_size, len(jobs)))
+        logger.info("Using shared browser pool with %d browser(s) for better performance", pool_size)
         
-        try:
-            # Process each category using the shared browser
-            success_count = 0
-            for category in categories:
-                if process_category_with_shared_browser(
-                    category,
-                    args.input_dir,
-                    args.output_dir,
+        # Persistent per-URL cache (shared file, one connection per worker) so recurring stories skip the page load
+        cache_path = os.path.join(args.output_dir, '.url_cache.db')
+        
+        # Resolve ChromeDriver once up front so forked workers inherit the cached path
+        _get_chromedriver_path()
+        
+        # Process categories in parallel, one browser per worker process
+        logger.info("Setting up shared browser instances for all categories...")
+        with ProcessPoolExecutor(
+            max_workers=pool_size,
+            initializer=worker_init,
+            initargs=(args.headless, args.recycle_after, cache_path)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    worker_process_category,
+                    job,
                     args.max_articles,
                     args.timeout,
                     args.summary_length,
-                    driver
-                ):
-                    success_count += 1
-        finally:
-            # Always clean up the browser instance
-            logger.info("Cleaning up shared browser instance...")
-            driver.quit()
+                    args.cdp_navigate
+                ): job[0]
+                for job in jobs
+            }
+            for future, category in futures.items():
+                try:
+                    if future.result():
+                        success_count += 1
+                except Exception as e:
+                    logger.error("Worker failed for category %s: %s", category, e)
         
-        logger.info(f"Processed {success_count}/{len(categories)} categories successfully")
+        logger.info("Processed %d/%d categories successfully", success_count, len(categories))
         
         if success_count == len(categories):
             return 0
@@ -244,7 +549,7 @@ def main():
             return 1
             
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         import traceback
         logger.error(traceback.format_exc())
         return 1
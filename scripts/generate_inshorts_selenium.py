@@ -15,8 +15,25 @@ from typing import Dict, List, Optional
 import traceback
 import re
 import hashlib  # For generating article IDs
+import sqlite3
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
+import itertools
+from urllib.parse import urlparse
+import httpx
+import lxml.html
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +42,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+FAST_FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="Generate Inshorts-style news summaries")
@@ -81,6 +105,78 @@ def parse_args():
 
 # Removed problematic caching system that created too many files
 
+class ArticleCache:
+    """
+    Persistent per-URL cache of extracted article details, stored in a single SQLite file.
+    Lets stories that recur across categories and runs skip the page load entirely.
+    Cache errors are logged and treated as misses so they never fail an article.
+    """
+    
+    def __init__(self, db_path: str, ttl: int = 7 * 24 * 3600, db_timeout: float = 30.0):
+        """
+        Initialize the article cache.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            ttl: Maximum age of cached entries in seconds
+            db_timeout: Seconds to wait for a lock held by another worker process
+        """
+        self.ttl = ttl
+        self._conn = sqlite3.connect(db_path, timeout=db_timeout, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL lets several worker processes read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles (url_hash TEXT PRIMARY KEY, json BLOB, ts INTEGER)"
+            )
+            self._conn.commit()
+        self.prune()
+    
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """Return cached article details for a URL, or None on a miss, expired entry or cache error"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT json FROM articles WHERE url_hash = ? AND ts >= ?",
+                    (self._key(url), int(time.time()) - self.ttl)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            # ValueError covers corrupt JSON rows
+            logger.warning(f"Article cache read failed, treating as miss: {e}")
+            return None
+    
+    def set(self, url: str, details: Dict):
+        """Store article details for a URL (skipped on cache error)"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO articles (url_hash, json, ts) VALUES (?, ?, ?)",
+                    (self._key(url), json.dumps(details), int(time.time()))
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Article cache write failed, skipping: {e}")
+    
+    def prune(self):
+        """Delete expired entries so the cache does not grow without bound"""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM articles WHERE ts < ?", (int(time.time()) - self.ttl,))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Article cache prune failed: {e}")
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
 def load_news_data(file_path: str) -> Dict:
     """Load news data from a JSON file"""
     try:
@@ -139,6 +235,104 @@ def setup_selenium(headless=True):
         logger.error(traceback.format_exc())
         raise
 
+def _is_google_news_url(url: str) -> bool:
+    """Check if URL points at a Google News page (which needs JavaScript to reach the article)"""
+    return (urlparse(url).hostname or '') == 'news.google.com'
+
+def create_http_session() -> httpx.Client:
+    """
+    Create a shared HTTP client for the fast metadata path.
+    Uses HTTP/2 when available so articles on the same news host share one multiplexed connection.
+    """
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        timeout=5.0,
+        follow_redirects=True,
+        headers=FAST_FETCH_HEADERS,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+    )
+
+def fast_fetch_meta(url: str, session: httpx.Client, timeout: int = 5) -> Optional[Dict]:
+    """
+    Extract article details with a plain HTTP request instead of a browser page load.
+    
+    Args:
+        url: URL of the article
+        session: Shared HTTP client
+        timeout: Timeout in seconds for the request
+        
+    Returns:
+        Dictionary with article details, or None if the metadata is incomplete
+        and the caller should fall back to Selenium
+    """
+    # Google News links only redirect via JavaScript - skip the request and go straight to the browser
+    if _is_google_news_url(url):
+        return None
+    
+    try:
+        resp = session.get(url, timeout=timeout)
+        resp.raise_for_status()
+        current_url = str(resp.url)
+        
+        if _is_google_news_url(current_url):
+            return None
+        
+        doc = lxml.html.fromstring(resp.content)
+        
+        def meta(xpath):
+            values = doc.xpath(xpath)
+            return values[0].strip() if values and values[0].strip() else None
+        
+        image_url = meta("//meta[@property='og:image']/@content") or meta("//meta[@name='twitter:image']/@content")
+        description = meta("//meta[@name='description']/@content") or meta("//meta[@property='og:description']/@content")
+        title = meta("//meta[@property='og:title']/@content") or meta("//title/text()")
+        
+        if not image_url or not description:
+            return None
+        
+        paragraphs = [p.text_content().strip() for p in doc.xpath("//p")]
+        page_text = "\n".join(p for p in paragraphs if p)
+        
+        logger.info(f"⚡ Fast path hit: {current_url}")
+        return {
+            "resolved_url": current_url,
+            "image_url": image_url,
+            "title": title,
+            "description": description[:500] + "..." if len(description) > 500 else description,
+            "text_excerpt": page_text[:1000] + "..." if len(page_text) > 1000 else page_text
+        }
+    except Exception as e:
+        logger.debug(f"Fast path failed for {url}: {e}")
+        return None
+
+def wait_for_og_tags(driver, timeout: int = 5) -> bool:
+    """
+    Wait until the publisher page has exposed its OG image meta tag.
+    
+    Explicit replacement for fixed sleeps/implicit waits: returns as soon as the
+    tag is present outside Google News, or after the timeout otherwise.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        timeout: Maximum time to wait in seconds
+        
+    Returns:
+        True if the tag was found, False on timeout
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    
+    try:
+        # Scripts can fail mid-navigation while Google News redirects - keep polling
+        WebDriverWait(driver, timeout, ignored_exceptions=(WebDriverException,)).until(
+            lambda d: "news.google.com" not in d.current_url and d.execute_script(
+                "return document.querySelector('meta[property=\"og:image\"]') !== null"
+            )
+        )
+        return True
+    except TimeoutException:
+        return False
+
 def _is_valid_article_url(url: str) -> bool:
     """Check if URL is a valid article URL (not social media, ads, etc.)"""
     if not url or not url.startswith(('http://', 'https://')):
@@ -184,7 +378,11 @@ def _is_valid_article_url(url: str) -> bool:
     # Default: if it's not obviously bad, allow it
     return len(url) > 20 and '/' in url[10:]
 
-def extract_article_details(url: str, driver, timeout: int = 10) -> Dict:
+def _webdriver_get(driver, url: str, timeout: int):
+    """Default navigate callable - a classic WebDriver get()"""
+    driver.get(url)
+
+def extract_article_details(url: str, driver, timeout: int = 10, navigate=None) -> Dict:
     """
     Extract article details using Selenium WebDriver.
     
@@ -192,6 +390,8 @@ def extract_article_details(url: str, driver, timeout: int = 10) -> Dict:
         url: URL of the article
         driver: Selenium WebDriver instance
         timeout: Timeout in seconds for loading the page
+        navigate: Optional navigate(driver, url, timeout) callable used instead of driver.get()
+                  for every page load, including the Google News fallback navigation
         
     Returns:
         Dictionary with article details
@@ -199,10 +399,11 @@ def extract_article_details(url: str, driver, timeout: int = 10) -> Dict:
     try:
         # Navigate to the URL
         logger.info(f"Navigating to: {url}")
-        driver.get(url)
+        navigate = navigate or _webdriver_get
+        navigate(driver, url, timeout)
         
-        # Wait for the page to load
-        time.sleep(min(timeout, 5))  # Wait at least some time for JavaScript to execute
+        # Wait for the OG tags (or any Google News JS redirect) instead of a fixed sleep
+        wait_for_og_tags(driver, min(timeout, 5))
         
         # Get the current URL (after any redirects)
         current_url = driver.current_url
@@ -269,7 +470,7 @@ def extract_article_details(url: str, driver, timeout: int = 10) -> Dict:
                         else:
                             # Fallback: direct navigation
                             logger.info("🔄 Click failed, trying direct navigation...")
-                            driver.get(actual_url)
+                            navigate(driver, actual_url, timeout)
                             time.sleep(3)
                             current_url = driver.current_url
                             logger.info(f"✅ Direct navigation successful: {current_url}")
@@ -277,7 +478,7 @@ def extract_article_details(url: str, driver, timeout: int = 10) -> Dict:
                     except Exception as e:
                         logger.warning(f"Click failed, trying direct navigation: {e}")
                         # Fallback: direct navigation
-                        driver.get(actual_url)
+                        navigate(driver, actual_url, timeout)
                         time.sleep(3)
                         current_url = driver.current_url
                         logger.info(f"✅ Direct navigation successful: {current_url}")
@@ -452,7 +653,10 @@ def generate_summary(text: str, max_words: int = 60) -> str:
         logger.error(f"Error generating summary: {e}")
         return text[:200] + "..." if text and len(text) > 200 else text or "No content available for summarization."
 
-def process_single_article(article: Dict, driver, timeout: int, summary_length: int) -> Dict:
+def process_single_article(article: Dict, driver, timeout: int, summary_length: int,
+                           session: Optional[httpx.Client] = None,
+                           cache: Optional[ArticleCache] = None,
+                           navigate=None) -> Dict:
     """Process a single article (simplified without problematic caching)"""
     try:
         title = article.get('title', 'Unknown Title')
@@ -474,8 +678,18 @@ def process_single_article(article: Dict, driver, timeout: int, summary_length:
         
         logger.debug(f"🔄 Processing: {title[:50]}... - {source}")
         
-        # Extract article details using Selenium
-        article_details = extract_article_details(url, driver, timeout)
+        # Reuse details extracted in a previous run or category
+        article_details = cache.get(url) if cache else None
+        
+        if article_details is None:
+            # Try the fast HTTP path first, fall back to Selenium when metadata is incomplete
+            article_details = fast_fetch_meta(url, session, min(timeout, 5)) if session else None
+            if article_details is None:
+                article_details = extract_article_details(url, driver, timeout, navigate)
+            # Only cache fully resolved results so failed Google News redirects are retried
+            resolved_url = article_details.get('resolved_url') or ''
+            if cache and 'error' not in article_details and 'news.google.com' not in resolved_url:
+                cache.set(url, article_details)
         
         # Generate summary
         if article_details['text_excerpt']:
@@ -515,18 +729,24 @@ def process_single_article(article: Dict, driver, timeout: int, summary_length:
         }
 
 def process_news_data(news_data: Dict, max_articles: int, driver, timeout: int, summary_length: int, 
-                     max_workers: int = 3, use_cache: bool = False) -> List[Dict]:
+                     max_workers: int = 3, use_cache: bool = False,
+                     session: Optional[httpx.Client] = None,
+                     cache: Optional[ArticleCache] = None,
+                     navigate=None) -> List[Dict]:
     """
     Process news data with CONCURRENT PROCESSING (simplified without problematic caching).
     
     Args:
-        news_data: News data from JSON file
+        news_data: News data from JSON file; 'articles' may be any iterable
         max_articles: Maximum number of articles to process
         driver: Selenium WebDriver instance
         timeout: Timeout in seconds for each article
         summary_length: Maximum length of summary in words
         max_workers: Maximum number of concurrent workers
         use_cache: Disabled to avoid file creation issues
+        session: Optional HTTP client for the fast metadata path
+        cache: Optional persistent per-URL article cache
+        navigate: Optional navigate(driver, url, timeout) callable used instead of driver.get()
         
     Returns:
         List of dictionaries with Inshorts-style summaries
@@ -537,8 +757,8 @@ def process_news_data(news_data: Dict, max_articles: int, driver, timeout: int,
         logger.error("No 'articles' field found in the news data")
         return processed_articles
     
-    # Limit the number of articles to process
-    articles_to_process = news_data['articles'][:max_articles]
+    # Limit the number of articles to process ('articles' may be a list or a lazy iterable)
+    articles_to_process = list(itertools.islice(news_data['articles'], max_articles))
     logger.info(f"🚀 Processing {len(articles_to_process)} articles with CONCURRENT PROCESSING (workers: {max_workers})")
     
     # PERFORMANCE OPTIMIZATION: Track processing metrics
@@ -549,7 +769,7 @@ def process_news_data(news_data: Dict, max_articles: int, driver, timeout: int,
         # Sequential processing (fallback)
         logger.info("🔄 Using sequential processing")
         for i, article in enumerate(articles_to_process):
-            result = process_single_article(article, driver, timeout, summary_length)
+            result = process_single_article(article, driver, timeout, summary_length, session, cache, navigate)
             processed_articles.append(result)
             if 'error' not in result:
                 successful_articles += 1
@@ -571,7 +791,7 @@ def process_news_data(news_data: Dict, max_articles: int, driver, timeout: int,
                 for i, article in enumerate(articles_to_process):
                     # Distribute articles across available drivers
                     driver_to_use = drivers[i % len(drivers)]
-                    future = executor.submit(process_single_article, article, driver_to_use, timeout, summary_length)
+                    future = executor.submit(process_single_article, article, driver_to_use, timeout, summary_length, session, cache, navigate)
                     future_to_article[future] = article
                 
                 # Collect results as they complete
@@ -638,14 +858,18 @@ def generate_article_id(url: str, title: str, source: str) -> str:
     # Return the hexadecimal digest
     return hash_obj.hexdigest()
 
-def save_to_json(data: Dict, output_path: str):
-    """Save Inshorts-style summaries to a JSON file"""
+def save_to_json(data: Dict, output_path: str, make_dirs: bool = True):
+    """Save Inshorts-style summaries to a JSON file (make_dirs=False when the caller already created the directory)"""
     # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    if make_dirs:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
     
-    # Save data to JSON file
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Save data to JSON file (orjson is much faster when available)
+    if ORJSON_AVAILABLE:
+        Path(output_path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
     
     logger.info(f"Inshorts-style summaries saved to {output_path}")
     logger.info(f"Processed {len(data['articles'])} articles")
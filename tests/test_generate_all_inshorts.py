@@ -0,0 +1,316 @@
+import unittest
+from unittest.mock import patch
+import multiprocessing
+import sys
+import os
+import json
+import tempfile
+
+# Add scripts directory to path to import the generator scripts
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+import generate_all_inshorts
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from generate_all_inshorts import stream_articles, is_up_to_date, filter_pending_jobs, ManagedDriver, process_category_with_shared_browser, cdp_navigate
+
+
+class TestStreamArticles(unittest.TestCase):
+    """Tests for the per-category article reader"""
+    
+    def setUp(self):
+        """Write a news file with more articles than requested"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.tmp_dir.name, 'news_test.json')
+        self.articles = [{'title': f'Article {i}', 'link': f'https://example.com/{i}'} for i in range(5)]
+        with open(self.input_file, 'w', encoding='utf-8') as f:
+            json.dump({'metadata': {}, 'articles': self.articles}, f)
+    
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp_dir.cleanup()
+    
+    @unittest.skipUnless(generate_all_inshorts.IJSON_AVAILABLE, "ijson not installed")
+    def test_limit_with_ijson(self):
+        """Test that only the first n articles are read with ijson"""
+        result = stream_articles(self.input_file, 3)
+        
+        self.assertIsInstance(result, list)
+        self.assertEqual(result, self.articles[:3])
+    
+    @patch('generate_all_inshorts.IJSON_AVAILABLE', False)
+    def test_limit_without_ijson(self):
+        """Test the full-load fallback when ijson is not installed"""
+        result = stream_articles(self.input_file, 3)
+        
+        self.assertEqual(result, self.articles[:3])
+    
+    @patch('generate_all_inshorts.IJSON_AVAILABLE', False)
+    def test_limit_larger_than_file(self):
+        """Test that asking for more articles than exist returns them all"""
+        self.assertEqual(stream_articles(self.input_file, 10), self.articles)
+
+
+class TestUpToDate(unittest.TestCase):
+    """Tests for skipping categories whose output is newer than their input"""
+    
+    def setUp(self):
+        """Create an input and output file with controlled mtimes"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.tmp_dir.name, 'news_top.json')
+        self.output_file = os.path.join(self.tmp_dir.name, 'inshorts_top.json')
+        for path in (self.input_file, self.output_file):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('{}')
+        self.job = ('top', self.input_file, self.output_file)
+    
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp_dir.cleanup()
+    
+    def set_mtimes(self, input_mtime, output_mtime):
+        os.utime(self.input_file, (input_mtime, input_mtime))
+        os.utime(self.output_file, (output_mtime, output_mtime))
+    
+    def test_output_older_than_input(self):
+        """Test that a stale output is reprocessed"""
+        self.set_mtimes(2000, 1000)
+        
+        self.assertFalse(is_up_to_date(self.input_file, self.output_file))
+        self.assertEqual(filter_pending_jobs([self.job]), [self.job])
+    
+    def test_output_newer_than_input(self):
+        """Test that a fresh output is skipped"""
+        self.set_mtimes(1000, 2000)
+        
+        self.assertTrue(is_up_to_date(self.input_file, self.output_file))
+        self.assertEqual(filter_pending_jobs([self.job]), [])
+    
+    def test_missing_files(self):
+        """Test that a missing input or output is never up to date"""
+        os.remove(self.input_file)
+        self.assertFalse(is_up_to_date(self.input_file, self.output_file))
+        self.assertEqual(filter_pending_jobs([self.job]), [self.job])
+        
+        os.remove(self.output_file)
+        with open(self.input_file, 'w', encoding='utf-8') as f:
+            f.write('{}')
+        self.assertFalse(is_up_to_date(self.input_file, self.output_file))
+    
+    def test_force_keeps_jobs(self):
+        """Test that --force reprocesses up-to-date categories"""
+        self.set_mtimes(1000, 2000)
+        
+        self.assertEqual(filter_pending_jobs([self.job], force=True), [self.job])
+
+
+class FakeDriver:
+    """Minimal stand-in for a Selenium WebDriver"""
+    
+    current_url = 'about:blank'
+    
+    def __init__(self):
+        self.quit_called = False
+    
+    def get(self, url):
+        pass
+    
+    def quit(self):
+        self.quit_called = True
+
+
+class DeadDriver(FakeDriver):
+    """WebDriver whose chromedriver process has died"""
+    
+    @property
+    def current_url(self):
+        raise ConnectionRefusedError("chromedriver is gone")
+
+
+def setup_browser_stub(*results):
+    """Build a setup_shared_browser stub returning (or raising) the given results in order"""
+    results = list(results)
+    
+    def setup(headless=True, user_data_dir=None):
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return setup
+
+
+class TestManagedDriver(unittest.TestCase):
+    """Tests for browser recycling and respawning"""
+    
+    def test_recycles_after_limit(self):
+        """Test that the browser is replaced once enough pages were loaded"""
+        first, second = FakeDriver(), FakeDriver()
+        with patch('generate_all_inshorts.setup_shared_browser', setup_browser_stub(first, second)):
+            managed = ManagedDriver(recycle_after=3)
+            managed.record(2)
+            self.assertIs(managed.driver, first)
+            
+            managed.record(1)
+            self.assertIs(managed.driver, second)
+            self.assertTrue(first.quit_called)
+            self.assertEqual(managed.articles_processed, 0)
+            managed.quit()
+    
+    def test_ensure_alive_respawns_dead_driver(self):
+        """Test that a dead chromedriver (connection error) triggers a respawn"""
+        dead, fresh = DeadDriver(), FakeDriver()
+        with patch('generate_all_inshorts.setup_shared_browser', setup_browser_stub(dead, fresh)):
+            managed = ManagedDriver()
+            managed.ensure_alive()
+            self.assertIs(managed.driver, fresh)
+            managed.quit()
+    
+    def test_lazy_start(self):
+        """Test that start=False defers the browser start to ensure_alive()"""
+        driver = FakeDriver()
+        with patch('generate_all_inshorts.setup_shared_browser', setup_browser_stub(driver)):
+            managed = ManagedDriver(start=False)
+            self.assertIsNone(managed.driver)
+            
+            managed.ensure_alive()
+            self.assertIs(managed.driver, driver)
+            managed.quit()
+
+
+class TestProcessCategory(unittest.TestCase):
+    """Tests for processing a single category with a managed browser"""
+    
+    def setUp(self):
+        """Create an input file for one category"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.tmp_dir.name, 'news_top.json')
+        self.output_file = os.path.join(self.tmp_dir.name, 'inshorts_top.json')
+        with open(self.input_file, 'w', encoding='utf-8') as f:
+            json.dump({'articles': [{'title': 'A', 'link': 'https://news.google.com/rss/articles/a'}]}, f)
+    
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp_dir.cleanup()
+    
+    @staticmethod
+    def fake_process_news_data(news_data, max_articles, driver, timeout, summary_length, navigate=None, **kwargs):
+        """Simulate a Google News article: the redirect page plus the fallback navigation"""
+        navigate(driver, 'https://news.google.com/rss/articles/a', timeout)
+        navigate(driver, 'https://example.com/a', timeout)
+        return [{'id': 'a', 'title': 'A'}]
+    
+    def test_counts_fallback_loads_and_survives_failed_recycle(self):
+        """Test that every page load counts and a failed recycle keeps the written output"""
+        with patch('generate_all_inshorts.setup_shared_browser',
+                   setup_browser_stub(FakeDriver(), RuntimeError("no chrome"))), \
+             patch('generate_all_inshorts.process_news_data', self.fake_process_news_data):
+            managed = ManagedDriver(recycle_after=2)
+            result = process_category_with_shared_browser(
+                ('top', self.input_file, self.output_file), 10, 5, 60, managed
+            )
+        
+        self.assertTrue(result)
+        self.assertTrue(os.path.exists(self.output_file))
+        # Both loads counted, so the recycle was attempted; its failure left the browser for ensure_alive()
+        self.assertIsNone(managed.driver)
+
+
+def setup_browser_failing_once(marker_path):
+    """Build a setup_shared_browser stub whose very first call (across all processes) fails"""
+    def setup(headless=True, user_data_dir=None):
+        try:
+            os.close(os.open(marker_path, os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            return FakeDriver()
+        raise RuntimeError("Chrome failed to start")
+    return setup
+
+
+class FakeCdpDriver:
+    """Fake WebDriver answering CDP readiness polls from a script of states"""
+    
+    def __init__(self, poll_states):
+        self.poll_states = list(poll_states)
+        self.polls = 0
+        self.navigated_to = None
+    
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Page.navigate":
+            self.navigated_to = params["url"]
+            return {"frameId": "frame", "loaderId": "loader"}
+        if "? 'stale'" not in params["expression"]:
+            return {"result": {}}  # Marking the outgoing document
+        self.polls += 1
+        state = self.poll_states.pop(0) if self.poll_states else 'stale'
+        if isinstance(state, Exception):
+            raise state
+        return {"result": {"type": "string", "value": state}}
+
+
+class TestCdpNavigate(unittest.TestCase):
+    """Tests for navigation via direct CDP commands"""
+    
+    def test_waits_through_stale_and_errors_until_ready(self):
+        """Test that the old document and context errors are polled past"""
+        driver = FakeCdpDriver(['stale', WebDriverException("Execution context was destroyed"), 'interactive'])
+        
+        cdp_navigate(driver, 'https://example.com/a', timeout=5)
+        
+        self.assertEqual(driver.navigated_to, 'https://example.com/a')
+        self.assertEqual(driver.polls, 3)
+    
+    def test_ready_immediately(self):
+        """Test that an already interactive new document returns on the first poll"""
+        driver = FakeCdpDriver(['complete'])
+        
+        cdp_navigate(driver, 'https://example.com/a', timeout=5)
+        
+        self.assertEqual(driver.polls, 1)
+    
+    def test_timeout_raises(self):
+        """Test that a navigation that never commits raises like driver.get()"""
+        driver = FakeCdpDriver([])
+        
+        with self.assertRaises(TimeoutException):
+            cdp_navigate(driver, 'https://example.com/a', timeout=0.3)
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "stubs are inherited by forked workers only")
+class TestWorkerPool(unittest.TestCase):
+    """Tests for processing categories in the worker process pool"""
+    
+    def setUp(self):
+        """Create input files for several categories"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp_dir.name, 'in')
+        self.output_dir = os.path.join(self.tmp_dir.name, 'out')
+        os.makedirs(self.input_dir)
+        self.categories = ['top', 'world', 'tech', 'sports']
+        for category in self.categories:
+            with open(os.path.join(self.input_dir, f'news_{category}.json'), 'w', encoding='utf-8') as f:
+                json.dump({'articles': [{'title': 'A', 'link': 'https://example.com/a'}]}, f)
+    
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp_dir.cleanup()
+    
+    def test_browser_startup_failure_only_fails_one_category(self):
+        """Test that a browser that fails to start does not break the pool"""
+        argv = ['generate_all_inshorts.py', '--input-dir', self.input_dir, '--output-dir', self.output_dir,
+                '--parallel', '2', '--force']
+        marker = os.path.join(self.tmp_dir.name, 'first-start')
+        
+        with patch.object(sys, 'argv', argv), \
+             patch('generate_all_inshorts._get_chromedriver_path', return_value='chromedriver'), \
+             patch('generate_all_inshorts.setup_shared_browser', setup_browser_failing_once(marker)), \
+             patch('generate_all_inshorts.process_news_data', return_value=[]):
+            result = generate_all_inshorts.main()
+        
+        self.assertEqual(result, 1)
+        written = [c for c in self.categories
+                   if os.path.exists(os.path.join(self.output_dir, f'inshorts_{c}.json'))]
+        self.assertEqual(len(written), len(self.categories) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+import httpx
+
+# Add scripts directory to path to import the generator scripts
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from selenium.common.exceptions import WebDriverException
+
+from generate_inshorts_selenium import fast_fetch_meta, ArticleCache, wait_for_og_tags
+
+
+ARTICLE_HTML = b"""
+<html>
+  <head>
+    <title>Fallback Title</title>
+    <meta property="og:title" content="Test Article">
+    <meta property="og:image" content="https://example.com/image.jpg">
+    <meta name="description" content="A test article description.">
+  </head>
+  <body>
+    <p>First paragraph of the article.</p>
+    <p>Second paragraph of the article.</p>
+  </body>
+</html>
+"""
+
+NO_OG_HTML = b"""
+<html>
+  <head><title>No OG Tags</title></head>
+  <body><p>Just some text.</p></body>
+</html>
+"""
+
+
+class TestFastFetchMeta(unittest.TestCase):
+    """Tests for the requests-free fast metadata path"""
+    
+    def setUp(self):
+        """Set up a client backed by a mock transport"""
+        self.requested_urls = []
+        
+        def handler(request):
+            self.requested_urls.append(str(request.url))
+            if request.url.path == '/no-og':
+                return httpx.Response(200, content=NO_OG_HTML)
+            return httpx.Response(200, content=ARTICLE_HTML)
+        
+        self.client = httpx.Client(transport=httpx.MockTransport(handler), follow_redirects=True)
+    
+    def tearDown(self):
+        """Close the mock client"""
+        self.client.close()
+    
+    def test_hit(self):
+        """Test that complete OG metadata is returned without the browser"""
+        result = fast_fetch_meta('https://example.com/news/article', self.client)
+        
+        self.assertIsNotNone(result)
+        self.assertEqual(result['resolved_url'], 'https://example.com/news/article')
+        self.assertEqual(result['image_url'], 'https://example.com/image.jpg')
+        self.assertEqual(result['title'], 'Test Article')
+        self.assertEqual(result['description'], 'A test article description.')
+        self.assertIn('First paragraph of the article.', result['text_excerpt'])
+    
+    def test_missing_og_miss(self):
+        """Test that pages without OG metadata fall back to the browser"""
+        result = fast_fetch_meta('https://example.com/no-og', self.client)
+        
+        self.assertIsNone(result)
+        self.assertEqual(self.requested_urls, ['https://example.com/no-og'])
+    
+    def test_google_news_miss(self):
+        """Test that Google News links skip the HTTP request entirely"""
+        result = fast_fetch_meta('https://news.google.com/rss/articles/CBMiabc?oc=5', self.client)
+        
+        self.assertIsNone(result)
+        self.assertEqual(self.requested_urls, [])
+
+
+class TestArticleCache(unittest.TestCase):
+    """Tests for the persistent per-URL article cache"""
+    
+    def setUp(self):
+        """Set up a cache in a temporary directory"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, '.url_cache.db')
+        self.cache = ArticleCache(self.db_path, ttl=60)
+    
+    def tearDown(self):
+        """Close the cache and remove the temporary directory"""
+        self.cache.close()
+        self.tmp_dir.cleanup()
+    
+    def test_get_set(self):
+        """Test that stored details are returned for the same URL only"""
+        details = {'resolved_url': 'https://example.com/a', 'image_url': 'https://example.com/a.jpg'}
+        self.cache.set('https://example.com/a', details)
+        
+        self.assertEqual(self.cache.get('https://example.com/a'), details)
+        self.assertIsNone(self.cache.get('https://example.com/b'))
+    
+    def test_ttl_expiry(self):
+        """Test that expired entries are misses and pruned"""
+        with patch('generate_inshorts_selenium.time.time', return_value=1000):
+            self.cache.set('https://example.com/a', {'image_url': None})
+        
+        with patch('generate_inshorts_selenium.time.time', return_value=1000 + 61):
+            self.assertIsNone(self.cache.get('https://example.com/a'))
+            self.cache.prune()
+        
+        count = self.cache._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        self.assertEqual(count, 0)
+    
+    def test_corrupt_row_is_miss(self):
+        """Test that an undecodable cached row is treated as a miss"""
+        self.cache._conn.execute(
+            "INSERT INTO articles (url_hash, json, ts) VALUES (?, ?, ?)",
+            (ArticleCache._key('https://example.com/a'), '{not json', 10 ** 10)
+        )
+        self.cache._conn.commit()
+        
+        self.assertIsNone(self.cache.get('https://example.com/a'))
+    
+    def test_errors_are_misses(self):
+        """Test that database errors never propagate to the caller"""
+        self.cache._conn.close()
+        
+        self.assertIsNone(self.cache.get('https://example.com/a'))
+        self.cache.set('https://example.com/a', {'image_url': None})
+
+
+class FlakyRedirectDriver:
+    """Fake WebDriver whose first script runs while the document is unloading"""
+    
+    current_url = 'https://example.com/news/article'
+    
+    def __init__(self, failures=1, result=True):
+        self.failures = failures
+        self.result = result
+        self.calls = 0
+    
+    def execute_script(self, script):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise WebDriverException("document unloaded while waiting for result")
+        return self.result
+
+
+class TestWaitForOgTags(unittest.TestCase):
+    """Tests for the explicit OG tag wait"""
+    
+    def test_ignores_errors_during_navigation(self):
+        """Test that a script error mid-navigation is retried instead of propagated"""
+        driver = FlakyRedirectDriver(failures=1)
+        
+        self.assertTrue(wait_for_og_tags(driver, timeout=2))
+        self.assertEqual(driver.calls, 2)
+    
+    def test_timeout(self):
+        """Test that a page without OG tags returns False after the timeout"""
+        driver = FlakyRedirectDriver(failures=0, result=False)
+        
+        self.assertFalse(wait_for_og_tags(driver, timeout=0.6))
+
+
+if __name__ == '__main__':
+    unittest.main()